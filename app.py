@@ -5,8 +5,16 @@ A terminal-based application for cleaning up directories by removing
 specific folders (like node_modules, __pycache__) and files by extension.
 """
 
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
-import shutil
+from typing import Iterable
+import asyncio
+import os
+import queue
+import threading
+import time
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
@@ -27,7 +35,26 @@ from textual.widgets import (
 from textual.containers import Grid
 from textual.worker import Worker, get_current_worker
 
-from scanner import Scanner, ScanResult, format_size
+from fast_rm import DEFAULT_WORKERS as DELETE_WORKERS, remove_trees
+from scanner import PatternSet, Scanner, ScanResult, format_size
+
+# Markers shown in the SEL column
+MARKER_SELECTED = "✓ DEL"
+MARKER_KEEP = "  keep"
+
+# Threads used to compute result sizes outside the scan
+SIZE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Shown in the SIZE column until a row's size has been computed
+SIZE_PENDING = "—"
+
+# Status text and progress bar updates are limited to about 30 per second
+UI_TICK_INTERVAL = 1 / 30
+
+# Scan results are added to the table once this many are pending...
+SCAN_FLUSH_ROWS = 64
+# ...or once this many seconds have passed since the last flush
+SCAN_FLUSH_INTERVAL = 0.1
 
 
 class HelpModal(ModalScreen[None]):
@@ -82,7 +109,6 @@ class ConfirmModal(ModalScreen[bool]):
     def __init__(self, items: list[ScanResult]) -> None:
         super().__init__()
         self.items = items
-        self.total_size = sum(item.size for item in items)
         self.folder_count = sum(1 for item in items if item.item_type == "folder")
         self.file_count = sum(1 for item in items if item.item_type == "file")
 
@@ -94,7 +120,7 @@ class ConfirmModal(ModalScreen[bool]):
                 with Horizontal(classes="stat-row"):
                     yield Label(f"Folders: {self.folder_count}", classes="stat-item")
                     yield Label(f"Files: {self.file_count}", classes="stat-item")
-                yield Label(f"Total Size: {format_size(self.total_size)}", id="stat-total")
+                yield Label("Total Size: calculating...", id="stat-total")
 
             yield Label("These actions cannot be undone.", id="confirm-warning")
             
@@ -102,6 +128,37 @@ class ConfirmModal(ModalScreen[bool]):
                 yield Button("Cancel", variant="default", id="confirm-cancel")
                 yield Button("DELETE EVERYTHING", variant="error", id="confirm-delete")
 
+    def on_mount(self) -> None:
+        """Start sizing the items; sizes are not computed during the scan."""
+        self.query_one("#stat-total", Label).loading = True
+        self.run_worker(self.compute_total_size, thread=True, exclusive=True)
+
+    def compute_total_size(self) -> None:
+        """Size the items on worker threads, then show the total."""
+        worker = get_current_worker()
+        executor = ThreadPoolExecutor(max_workers=SIZE_WORKERS)
+        try:
+            pending = {executor.submit(lambda item=item: item.size) for item in self.items}
+            total_size = 0
+            while pending:
+                # The worker is cancelled once the dialog is dismissed
+                if worker.is_cancelled:
+                    return
+                done, pending = wait(pending, timeout=0.1)
+                total_size += sum(future.result() for future in done)
+        finally:
+            # Drop the walks not started yet; running ones finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.app.call_from_thread(self.show_total_size, total_size)
+
+    def show_total_size(self, total_size: int) -> None:
+        """Replace the spinner with the total size."""
+        if not self.is_attached:
+            return
+        label = self.query_one("#stat-total", Label)
+        label.loading = False
+        label.update(f"Total Size: {format_size(total_size)}")
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         self.dismiss(event.button.id == "confirm-delete")
 
@@ -133,8 +190,26 @@ class DirectoryCleanerApp(App):
         super().__init__()
         self.scanner = Scanner()
         self.scan_results: list[ScanResult] = []
-        self.selected_indices: set[int] = set()
+        # Every result is selected unless its index is in here
+        self.deselected_indices: set[int] = set()
+        # Indices currently drawn with the keep marker
+        self._displayed_deselected: set[int] = set()
+        # Running byte totals of the sizes computed so far, kept up to date
+        # as sizes arrive and rows are toggled
+        self._total_size = 0
+        self._deselected_size = 0
+        # Sizes are computed in the background for rows that come into view;
+        # walks still queued or running are kept by row index
+        self._size_executor = ThreadPoolExecutor(max_workers=SIZE_WORKERS)
+        self._size_futures: dict[int, Future] = {}
+        # Rows whose size apply_row_size has added to the totals; sizes
+        # computed elsewhere (e.g. by the confirm dialog) aren't counted
+        self._sized_indices: set[int] = set()
+        # Bumped whenever the results are replaced, so late sizes are dropped
+        self._results_generation = 0
         self.scan_directories: list[Path] = []
+        # When the last throttled status/progress update ran
+        self._last_ui = 0.0
         self._scan_worker: Worker | None = None
 
     def compose(self) -> ComposeResult:
@@ -219,11 +294,31 @@ class DirectoryCleanerApp(App):
         
         # Focus path input
         self.query_one("#path-input", Input).focus()
+        
+        # Size result rows as they scroll into view
+        self.watch(table, "scroll_y", self._on_results_scroll, init=False)
+
+    def on_unmount(self) -> None:
+        """Stop background size computations."""
+        self._size_executor.shutdown(wait=False, cancel_futures=True)
 
     def update_status(self, text: str) -> None:
         """Update the status text."""
         self.query_one("#status-text", Static).update(text)
 
+    def update_progress(self, text: str, progress: int) -> None:
+        """Update the status text and progress bar together."""
+        self.update_status(text)
+        self.query_one("#progress-bar", ProgressBar).update(progress=progress)
+
+    def _ui_due(self, force: bool = False) -> bool:
+        """Check whether a throttled status/progress update may run now."""
+        now = time.monotonic()
+        if force or now - self._last_ui >= UI_TICK_INTERVAL:
+            self._last_ui = now
+            return True
+        return False
+
     def action_show_help(self) -> None:
         """Show help modal."""
         self.push_screen(HelpModal())
@@ -329,28 +424,66 @@ class DirectoryCleanerApp(App):
 
     def toggle_selection(self, index: int) -> None:
         """Toggle the selection state of a row."""
-        if index in self.selected_indices:
-            self.selected_indices.remove(index)
+        # A size not counted yet is added to the totals when it arrives
+        size = self.scan_results[index].size if index in self._sized_indices else 0
+        if index in self.deselected_indices:
+            self.deselected_indices.remove(index)
+            self._deselected_size -= size
         else:
-            self.selected_indices.add(index)
-        self.update_table_display()
-
-    def update_table_display(self) -> None:
-        """Update the table to show selection state."""
+            self.deselected_indices.add(index)
+            self._deselected_size += size
+        self.update_table_display([index])
+
+    @property
+    def selected_count(self) -> int:
+        """Number of results currently selected for deletion."""
+        return len(self.scan_results) - len(self.deselected_indices)
+
+    def selected_items(self, reverse: bool = False) -> list[ScanResult]:
+        """Return the selected results in index order."""
+        items = [
+            result for idx, result in enumerate(self.scan_results)
+            if idx not in self.deselected_indices
+        ]
+        if reverse:
+            items.reverse()
+        return items
+
+    def update_table_display(self, changed: Iterable[int] | None = None) -> None:
+        """
+        Update the table to show selection state.
+
+        Only rows whose marker differs from what is on screen are rewritten.
+        Pass changed to limit the check to specific rows.
+        """
         table = self.query_one("#results-table", DataTable)
-        for idx in range(len(self.scan_results)):
-            marker = "✓ DEL" if idx in self.selected_indices else "  keep"
-            try:
-                table.update_cell_at((idx, 0), marker)
-            except:
-                pass
+        if changed is None:
+            changed = self.deselected_indices ^ self._displayed_deselected
+        with self.batch_update():
+            for idx in changed:
+                if idx in self.deselected_indices:
+                    marker = MARKER_KEEP
+                    self._displayed_deselected.add(idx)
+                else:
+                    marker = MARKER_SELECTED
+                    self._displayed_deselected.discard(idx)
+                try:
+                    table.update_cell_at((idx, 0), marker)
+                except:
+                    pass
         
-        # Update status
-        selected = len(self.selected_indices)
+        self.update_selection_status()
+
+    def update_selection_status(self) -> None:
+        """Show the selected count and the size of the rows sized so far."""
+        selected = self.selected_count
         total = len(self.scan_results)
         if selected > 0:
-            size = sum(self.scan_results[i].size for i in self.selected_indices)
-            self.update_status(f"{selected}/{total} selected ({format_size(size)}) - Click DELETE")
+            size = format_size(self._total_size - self._deselected_size)
+            if len(self._sized_indices) < total:
+                # Only part of the selection has been sized
+                size = f"≥ {size}"
+            self.update_status(f"{selected}/{total} selected ({size}) - Click DELETE")
         else:
             self.update_status(f"{total} items found - Click rows to select")
 
@@ -371,10 +504,7 @@ class DirectoryCleanerApp(App):
             self.notify("Enter patterns to find", severity="warning")
             return
         
-        # Clear results
-        self.query_one("#results-table", DataTable).clear()
-        self.scan_results = []
-        self.selected_indices = set()
+        self.clear_results()
         
         # Show progress
         progress = self.query_one("#progress-bar", ProgressBar)
@@ -385,77 +515,157 @@ class DirectoryCleanerApp(App):
         self.query_one("#scan-button", Button).disabled = True
         self.query_one("#cancel-button", Button).disabled = False
         
+        patterns = self.scanner.compile_patterns(folder_patterns, file_patterns)
+        
         self._scan_worker = self.run_worker(
-            self.perform_scan(folder_patterns, file_patterns),
+            partial(self.perform_scan, patterns),
             name="scanner",
             exclusive=True,
+            thread=True,
         )
 
-    async def perform_scan(
-        self, folder_patterns: list[str], file_patterns: list[str]
-    ) -> None:
-        """Perform the scan."""
-        worker = get_current_worker()
+    def clear_results(self) -> None:
+        """Empty the results table and reset selection and size state."""
+        self.query_one("#results-table", DataTable).clear()
+        self.scan_results = []
+        self.deselected_indices = set()
+        self._displayed_deselected = set()
+        self._total_size = 0
+        self._deselected_size = 0
+        for future in self._size_futures.values():
+            future.cancel()
+        self._size_futures = {}
+        self._sized_indices = set()
+        self._results_generation += 1
+
+    def add_result_rows(self, results: list[ScanResult]) -> None:
+        """Append a batch of scan results to the table, all selected."""
         table = self.query_one("#results-table", DataTable)
-        progress = self.query_one("#progress-bar", ProgressBar)
-        count = 0
+        base = len(self.scan_results)
+        self.scan_results.extend(results)
+        
+        # Hold off repainting until the whole batch is in the table
+        with self.batch_update():
+            for idx, result in enumerate(results, start=base):
+                type_str = "📁 FOLDER" if result.item_type == "folder" else "📄 file"
+                
+                # Show readable path
+                path_str = result.path
+                if len(path_str) > 50:
+                    path_str = "..." + path_str[-47:]
+                
+                table.add_row(
+                    MARKER_SELECTED,  # Selected by default
+                    type_str,
+                    path_str,
+                    SIZE_PENDING,  # Filled in once the row is on screen
+                    key=str(idx),
+                )
+        
+        self.request_visible_sizes()
+
+    def _on_results_scroll(self, scroll_y: float) -> None:
+        """Size the rows that scrolled into view."""
+        self.request_visible_sizes()
+
+    def request_visible_sizes(self) -> None:
+        """Compute sizes in the background for on-screen rows not yet requested."""
+        table = self.query_one("#results-table", DataTable)
+        first = int(table.scroll_y)
+        last = min(len(self.scan_results), first + table.size.height)
+        
+        # Drop queued walks for rows that scrolled away; they are requested
+        # again if the rows come back into view
+        for idx in [idx for idx in self._size_futures if not first <= idx < last]:
+            if self._size_futures[idx].cancel():
+                del self._size_futures[idx]
+        
+        for idx in range(first, last):
+            if idx not in self._size_futures and idx not in self._sized_indices:
+                self._size_futures[idx] = self._size_executor.submit(
+                    self._compute_row_size, self._results_generation, idx, self.scan_results[idx]
+                )
+
+    def _compute_row_size(self, generation: int, index: int, result: ScanResult) -> None:
+        """Compute one result's size on a background thread."""
+        if generation != self._results_generation:
+            return  # The results were replaced while this walk was queued
+        size = result.size
+        self.call_from_thread(self.apply_row_size, generation, index, size)
+
+    def apply_row_size(self, generation: int, index: int, size: int) -> None:
+        """Show a computed size and add it to the running totals."""
+        if generation != self._results_generation or index in self._sized_indices:
+            return
+        self._size_futures.pop(index, None)
+        self._sized_indices.add(index)
+        self._total_size += size
+        if index in self.deselected_indices:
+            self._deselected_size += size
+        try:
+            self.query_one("#results-table", DataTable).update_cell_at((index, 3), format_size(size))
+        except:
+            pass
+        if not (self._scan_worker and self._scan_worker.is_running):
+            self.update_selection_status()
+
+    def perform_scan(self, patterns: PatternSet) -> None:
+        """Perform the scan on a worker thread, streaming rows to the UI."""
+        worker = get_current_worker()
+        pending: list[ScanResult] = []
+        last_flush = time.monotonic()
+        found = 0
         
         try:
             for dir_idx, scan_dir in enumerate(self.scan_directories):
                 if worker.is_cancelled:
                     break
                 
-                progress.update(progress=dir_idx + 1)
-                self.update_status(f"Scanning {scan_dir.name}... ({count} found)")
+                # Always show a new directory; count updates in between are throttled
+                self._ui_due(force=True)
+                self.call_from_thread(
+                    self.update_progress, f"Scanning {scan_dir.name}... ({found} found)", dir_idx + 1
+                )
                 
                 for result in self.scanner.scan_directory(
-                    scan_dir, folder_patterns, file_patterns, include_sizes=True
+                    scan_dir, patterns, size_mode="lazy"
                 ):
                     if worker.is_cancelled:
                         break
                     
-                    self.scan_results.append(result)
-                    idx = len(self.scan_results) - 1
-                    
-                    # Auto-select all items
-                    self.selected_indices.add(idx)
+                    pending.append(result)
+                    found += 1
                     
-                    type_str = "📁 FOLDER" if result.item_type == "folder" else "📄 file"
-                    
-                    # Show readable path
-                    path_str = str(result.path)
-                    if len(path_str) > 50:
-                        path_str = "..." + path_str[-47:]
-                    
-                    table.add_row(
-                        "✓ DEL",  # Selected by default
-                        type_str,
-                        path_str,
-                        format_size(result.size),
-                        key=str(idx),
-                    )
-                    
-                    count += 1
-                    
-                    if count % 5 == 0:
-                        self.update_status(f"Scanning {scan_dir.name}... ({count} found)")
+                    # Add rows in batches so the table re-renders once per flush
+                    now = time.monotonic()
+                    if len(pending) >= SCAN_FLUSH_ROWS or now - last_flush > SCAN_FLUSH_INTERVAL:
+                        self.call_from_thread(self.add_result_rows, pending)
+                        pending = []
+                        last_flush = now
+                        if self._ui_due():
+                            self.call_from_thread(self.update_status, f"Scanning {scan_dir.name}... ({found} found)")
                     
         except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
+            self.call_from_thread(self.notify, f"Error: {e}", severity="error")
         finally:
-            self.query_one("#progress-bar", ProgressBar).display = False
-            self.query_one("#scan-button", Button).disabled = False
-            self.query_one("#cancel-button", Button).disabled = True
-            
-            if not worker.is_cancelled:
-                total = len(self.scan_results)
-                if total > 0:
-                    size = sum(r.size for r in self.scan_results)
-                    self.update_status(f"ALL {total} items selected ({format_size(size)}) - Click DELETE or unselect items to keep")
-                    self.notify(f"Found {total} items - All selected for deletion")
-                else:
-                    self.update_status("No matching items found")
-                    self.notify("No items found matching your patterns")
+            if pending:
+                self.call_from_thread(self.add_result_rows, pending)
+            self.call_from_thread(self.finish_scan, worker.is_cancelled)
+
+    def finish_scan(self, cancelled: bool) -> None:
+        """Restore the scan controls and report the results."""
+        self.query_one("#progress-bar", ProgressBar).display = False
+        self.query_one("#scan-button", Button).disabled = False
+        self.query_one("#cancel-button", Button).disabled = True
+        
+        if not cancelled:
+            total = len(self.scan_results)
+            if total > 0:
+                self.update_status(f"ALL {total} items selected - Click DELETE or unselect items to keep")
+                self.notify(f"Found {total} items - All selected for deletion")
+            else:
+                self.update_status("No matching items found")
+                self.notify("No items found matching your patterns")
 
     def action_cancel_scan(self) -> None:
         """Cancel the current scan or blur input."""
@@ -474,23 +684,25 @@ class DirectoryCleanerApp(App):
         """Select all items."""
         if not self.scan_results:
             return
-        self.selected_indices = set(range(len(self.scan_results)))
+        self.deselected_indices.clear()
+        self._deselected_size = 0
         self.update_table_display()
         self.notify("All items selected")
 
     def action_deselect_all(self) -> None:
         """Deselect all items."""
-        self.selected_indices = set()
+        self.deselected_indices = set(range(len(self.scan_results)))
+        self._deselected_size = self._total_size
         self.update_table_display()
         self.notify("All items deselected")
 
     def action_delete(self) -> None:
         """Delete selected items."""
-        if not self.selected_indices:
+        if not self.selected_count:
             self.notify("Nothing selected!", severity="warning")
             return
         
-        items = [self.scan_results[i] for i in sorted(self.selected_indices)]
+        items = self.selected_items()
         self.push_screen(ConfirmModal(items), self.handle_delete)
 
     def handle_delete(self, confirmed: bool) -> None:
@@ -499,45 +711,98 @@ class DirectoryCleanerApp(App):
             self.notify("Cancelled")
             return
         
-        count = len(self.selected_indices)
+        count = self.selected_count
         progress = self.query_one("#progress-bar", ProgressBar)
         progress.display = True
         progress.update(total=count, progress=0)
         
         self.run_worker(self.perform_deletion(), name="deleter", exclusive=True)
 
+    @staticmethod
+    def _delete_files(items: list[ScanResult], outcomes: queue.SimpleQueue) -> None:
+        """Delete files in order, posting (item, outcome) for each one."""
+        for item in items:
+            try:
+                if not os.path.exists(item.path):
+                    outcomes.put((item, "missing"))
+                    continue
+                os.unlink(item.path)
+                outcomes.put((item, "deleted"))
+            except Exception:
+                outcomes.put((item, "error"))
+
+    @staticmethod
+    def _delete_folders(
+        items: list[ScanResult], executor: ThreadPoolExecutor, outcomes: queue.SimpleQueue
+    ) -> None:
+        """Delete folders with remove_trees on executor, posting (item, outcome) for each one."""
+        remaining: dict[str, ScanResult] = {}
+        for item in items:
+            if os.path.exists(item.path):
+                remaining[item.path] = item
+            else:
+                outcomes.put((item, "missing"))
+        try:
+            for path, error in remove_trees(remaining, executor):
+                outcomes.put((remaining.pop(path), "error" if error else "deleted"))
+        except Exception:
+            pass  # e.g. the executor was shut down on cancel
+        finally:
+            for item in remaining.values():
+                outcomes.put((item, "error"))
+
     async def perform_deletion(self) -> None:
         """Perform deletion."""
         worker = get_current_worker()
         deleted = 0
         errors = 0
         
-        items = [self.scan_results[i] for i in sorted(self.selected_indices, reverse=True)]
+        items = self.selected_items(reverse=True)
         total = len(items)
         progress = self.query_one("#progress-bar", ProgressBar)
-        
-        for idx, item in enumerate(items):
-            if worker.is_cancelled:
-                break
-            
-            progress.update(progress=idx + 1)
-            self.update_status(f"Deleting {idx + 1}/{total}: {item.path.name}")
-            
-            try:
-                if item.path.exists():
-                    if item.item_type == "folder":
-                        shutil.rmtree(item.path)
-                    else:
-                        item.path.unlink()
+
+        # Files are grouped by parent directory so one task handles each
+        # directory's unlinks; folder trees are split into per-directory tasks
+        # on the same pool, so one huge folder still uses every thread
+        folders: list[ScanResult] = []
+        files_by_parent: dict[str, list[ScanResult]] = defaultdict(list)
+        for item in items:
+            if item.item_type == "folder":
+                folders.append(item)
+            else:
+                files_by_parent[os.path.dirname(item.path)].append(item)
+
+        outcomes: queue.SimpleQueue = queue.SimpleQueue()
+        executor = ThreadPoolExecutor(max_workers=DELETE_WORKERS)
+        for batch in files_by_parent.values():
+            executor.submit(self._delete_files, batch, outcomes)
+        # remove_trees waits on the pool's tasks, so it runs on its own thread
+        threading.Thread(
+            target=self._delete_folders, args=(folders, executor, outcomes), daemon=True
+        ).start()
+
+        finished = 0
+        try:
+            while finished < total and not worker.is_cancelled:
+                try:
+                    item, outcome = outcomes.get_nowait()
+                except queue.Empty:
+                    await asyncio.sleep(0.05)
+                    continue
+
+                finished += 1
+                if outcome == "deleted":
                     deleted += 1
-            except Exception as e:
-                errors += 1
+                elif outcome == "error":
+                    errors += 1
+                if self._ui_due(force=finished == total):
+                    self.update_progress(f"Deleted {finished}/{total}: {os.path.basename(item.path)}", finished)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # Clear
         progress.display = False
-        self.query_one("#results-table", DataTable).clear()
-        self.scan_results = []
-        self.selected_indices = set()
+        self.clear_results()
         
         self.update_status(f"Deleted {deleted} items" + (f" ({errors} errors)" if errors else ""))
         self.notify(f"✓ Deleted {deleted} items!" if errors == 0 else f"Deleted {deleted} items with {errors} errors")
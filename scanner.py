@@ -3,20 +3,118 @@ Scanner module for directory cleanup operations.
 Provides functionality to scan directories and match files/folders by patterns.
 """
 
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator, Literal
+import errno
 import fnmatch
+import functools
 import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Directory reads are syscall-bound, so use more threads than cores
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Directories nested deeper than this below the scan root are not visited
+MAX_SCAN_DEPTH = 256
+
+# Windows and macOS filesystems are case-insensitive by default
+_CASE_INSENSITIVE_FS = os.path.normcase("A") == "a" or sys.platform == "darwin"
+
+# Hyperscan is only used for folder patterns with more globs than this
+HYPERSCAN_MIN_GLOBS = 4
+
+# Seconds to wait for `du` before walking the directory instead
+DU_TIMEOUT = 30
+
+# (du arguments, bytes per reported unit) for Scanner.get_size_fast, or None
+if shutil.which("du") is None:
+    _DU_COMMAND = None
+elif sys.platform.startswith("linux"):
+    _DU_COMMAND = (["du", "-sb"], 1)
+else:
+    _DU_COMMAND = (["du", "-sk"], 1024)
+
+# Directory sizes can be summed with openat/fstatat relative to directory fds
+_HAVE_FD_WALK = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+# Directory fds one fd-relative size walk keeps open, one per level; several
+# walks run at once, so this stays well under small default fd limits
+_MAX_SIZE_WALK_FDS = 8
+# errnos for running out of file descriptors, per process and system-wide
+_OUT_OF_FDS = (errno.EMFILE, errno.ENFILE)
+
+# Byte units used by format_size
+_KB = 1024
+_MB = _KB * 1024
+_GB = _MB * 1024
+
+# Sentinel a traversal worker puts on the result queue when it exits
+_WORKER_DONE = object()
+
+# Maps a name to the glob pattern it matches, or None
+GlobMatcher = Callable[[str], "str | None"]
+
+
+# How scan_directory fills in ScanResult sizes:
+#   "none"  - always 0
+#   "lazy"  - computed on first access of ScanResult.size
+#   "eager" - computed by the traversal workers as items are found
+#   "fast"  - like "eager", but folder sizes come from one `du` call and are
+#             approximate (see Scanner.get_size_fast)
+SizeMode = Literal["none", "lazy", "eager", "fast"]
+
+
+@dataclass(frozen=True)
+class PatternSet:
+    """
+    Folder and file patterns compiled once for a scan.
+
+    All lookup keys are lowercased when ignore_case is set, so each directory
+    entry's name only needs folding once. Values are the patterns as typed.
+    """
+    literal_folders: dict[str, str]  # Folder name -> pattern
+    glob_folders: GlobMatcher | None  # Matcher for the remaining folder globs
+    literal_exts: dict[str, str]  # Dotted extension -> pattern
+    exact_names: dict[str, str]  # Exact file name -> pattern
+    suffix_exts: list[tuple[str, str]]  # Multi-dot suffix -> pattern
+    ignore_case: bool = False
 
 
 @dataclass
 class ScanResult:
     """Represents a matched item found during scanning."""
-    path: Path
+    path: str
     item_type: str  # "folder" or "file"
-    size: int  # Size in bytes
     matched_pattern: str  # The pattern that matched
+    _size: int | None = field(default=None, repr=False)  # None until computed
+
+    @property
+    def size(self) -> int:
+        """Size in bytes, computed on first access if not known yet."""
+        if self._size is None:
+            self._size = Scanner.get_size(self.path)
+        return self._size
+
+    @property
+    def known_size(self) -> int | None:
+        """Size in bytes if already computed, without computing it."""
+        return self._size
+
+    @property
+    def path_obj(self) -> Path:
+        """The matched path as a pathlib.Path."""
+        return Path(self.path)
 
 
 class Scanner:
@@ -25,11 +123,14 @@ class Scanner:
     def __init__(self):
         self.results: list[ScanResult] = []
         self._scanning = False
-        self._cancelled = False
+        # Shared with the traversal workers, which may run on other threads
+        self._cancelled = threading.Event()
+        # Match names the way the filesystem compares them
+        self.ignore_case = _CASE_INSENSITIVE_FS
 
     def cancel(self) -> None:
         """Cancel the current scan operation."""
-        self._cancelled = True
+        self._cancelled.set()
 
     @staticmethod
     def parse_patterns(pattern_string: str) -> list[str]:
@@ -39,139 +140,552 @@ class Scanner:
         return [p.strip() for p in pattern_string.split(",") if p.strip()]
 
     @staticmethod
-    def get_size(path: Path) -> int:
+    def get_size(path: str | Path) -> int:
         """Get the size of a file or directory in bytes."""
-        if path.is_file():
+        if os.path.isfile(path):
             try:
-                return path.stat().st_size
+                return os.stat(path).st_size
             except (OSError, PermissionError):
                 return 0
-        
-        total_size = 0
+        return Scanner._dir_size(path)
+
+    @staticmethod
+    def get_size_fast(path: str | Path) -> int:
+        """
+        Get an approximate directory size from a single `du` call.
+
+        GNU du reports apparent bytes; elsewhere du reports 1 KiB disk blocks,
+        so the result is only an estimate. Falls back to walking the tree if du
+        is missing, fails or times out.
+        """
+        if _DU_COMMAND is not None:
+            command, unit = _DU_COMMAND
+            try:
+                completed = subprocess.run(
+                    [*command, os.fspath(path)],
+                    capture_output=True,
+                    text=True,
+                    timeout=DU_TIMEOUT,
+                )
+                # du still prints a total when some entries were unreadable
+                return int(completed.stdout.split(maxsplit=1)[0]) * unit
+            except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+                pass
+        return Scanner._dir_size(path)
+
+    @staticmethod
+    def _dir_size(path: str | Path) -> int:
+        """Sum file sizes under a directory, walking by fd where supported."""
+        if _HAVE_FD_WALK:
+            return Scanner._dir_size_at(path)
+        return Scanner._dir_size_scandir(path)
+
+    @staticmethod
+    def _dir_size_at(path: str | Path) -> int:
+        """
+        Sum file sizes under a directory, opening each one relative to its parent's fd.
+
+        Each directory is opened once with openat and listed from its fd, so
+        the per-entry stat is an fstatat on a bare name instead of a lookup of
+        the full path. The walk keeps an explicit stack of open directories
+        (one fd per level) instead of recursing, so deep trees can't exhaust
+        the recursion limit. Below _MAX_SIZE_WALK_FDS levels, or when out of
+        fds, it walks the rest of a subtree by path instead.
+        """
+        def list_dir(fd: int) -> tuple[int, list[str]]:
+            """
+            Sum the files in a directory and collect its subdirectory names.
+
+            Raises OSError only when out of file descriptors.
+            """
+            size = 0
+            names = []
+            try:
+                with os.scandir(fd) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                names.append(entry.name)
+                            elif entry.is_file():
+                                size += entry.stat().st_size
+                        except (OSError, PermissionError):
+                            pass
+            except OSError as e:
+                if e.errno in _OUT_OF_FDS:
+                    raise
+            return size, names
+
+        def open_dir(name: str | Path, dir_fd: int | None) -> tuple[int, int, list[str]] | None:
+            """
+            Open and list a directory, returning (fd, file sizes, subdirectories).
+
+            Returns None if it can't be read; raises OSError when out of fds.
+            """
+            try:
+                fd = os.open(name, os.O_RDONLY | os.O_DIRECTORY, dir_fd=dir_fd)
+            except OSError as e:
+                if e.errno in _OUT_OF_FDS:
+                    raise
+                return None
+            try:
+                return fd, *list_dir(fd)
+            except OSError:
+                os.close(fd)
+                raise
+
+        try:
+            opened = open_dir(path, None)
+        except OSError:
+            return Scanner._dir_size_scandir(path)
+        if opened is None:
+            return 0
+
+        fd, total_size, names = opened
+        # (directory fd, its path, subdirectory names not visited yet)
+        stack = [(fd, os.fspath(path), names)]
         try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
+            while stack:
+                parent_fd, parent_path, names = stack[-1]
+                if not names:
+                    stack.pop()
+                    os.close(parent_fd)
+                    continue
+
+                name = names.pop()
+                if len(stack) < _MAX_SIZE_WALK_FDS:
                     try:
-                        fp = Path(dirpath) / filename
-                        total_size += fp.stat().st_size
-                    except (OSError, PermissionError):
-                        pass
-        except (OSError, PermissionError):
-            pass
+                        opened = open_dir(name, parent_fd)
+                    except OSError:
+                        pass  # Out of fds; walk this subtree by path below
+                    else:
+                        if opened is not None:
+                            fd, size, child_names = opened
+                            total_size += size
+                            stack.append((fd, os.path.join(parent_path, name), child_names))
+                        continue
+
+                # Too deep to hold another fd, or out of fds
+                total_size += Scanner._dir_size_scandir(
+                    os.path.join(parent_path, name)
+                )
+        finally:
+            for fd, _, _ in stack:
+                os.close(fd)
         return total_size
 
-    def match_folder(self, name: str, patterns: list[str]) -> str | None:
-        """Check if folder name matches any pattern. Returns matched pattern or None."""
+    @staticmethod
+    def _dir_size_scandir(path: str | Path) -> int:
+        """Sum file sizes under a directory using cached DirEntry stats."""
+        total_size = 0
+        # An explicit stack, so deep trees can't exhaust the recursion limit
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                total_size += entry.stat().st_size
+                        except (OSError, PermissionError):
+                            pass
+            except (OSError, PermissionError):
+                pass
+        return total_size
+
+    def compile_patterns(
+        self, folder_patterns: list[str], extension_patterns: list[str]
+    ) -> PatternSet:
+        """Compile parsed folder and extension patterns for scan_directory."""
+        literal_folders, glob_folders = self._compile_folders(
+            folder_patterns, self.ignore_case
+        )
+        literal_exts, exact_names, suffix_exts = self._compile_extensions(
+            extension_patterns, self.ignore_case
+        )
+        return PatternSet(
+            literal_folders=literal_folders,
+            glob_folders=glob_folders,
+            literal_exts=literal_exts,
+            exact_names=exact_names,
+            suffix_exts=suffix_exts,
+            ignore_case=self.ignore_case,
+        )
+
+    @staticmethod
+    def _compile_folders(
+        patterns: list[str], ignore_case: bool
+    ) -> tuple[dict[str, str], GlobMatcher | None]:
+        """
+        Split folder patterns into literal names and one glob matcher.
+
+        Literal names are matched with a dict lookup. The remaining globs are
+        compiled once into a Hyperscan database when the hyperscan package is
+        installed and there are many of them, otherwise into a single regex
+        alternation.
+        """
+        literals: dict[str, str] = {}
+        globs: list[str] = []
         for pattern in patterns:
-            # Support exact match and glob patterns
-            if fnmatch.fnmatch(name, pattern) or name == pattern:
-                return pattern
-        return None
+            if any(c in pattern for c in "*?["):
+                globs.append(pattern)
+            else:
+                literals.setdefault(pattern.lower() if ignore_case else pattern, pattern)
 
-    def match_file(self, name: str, extensions: list[str]) -> str | None:
-        """Check if file matches any extension pattern. Returns matched pattern or None."""
+        matcher = None
+        if globs:
+            if len(globs) > HYPERSCAN_MIN_GLOBS:
+                matcher = _hyperscan_glob_matcher(globs, ignore_case)
+            if matcher is None:
+                matcher = _regex_glob_matcher(globs, ignore_case)
+        return literals, matcher
+
+    @staticmethod
+    def _compile_extensions(
+        extensions: list[str], ignore_case: bool
+    ) -> tuple[dict[str, str], dict[str, str], list[tuple[str, str]]]:
+        """
+        Index file extension patterns for constant-time lookup.
+
+        Single-dot extensions are keyed by their dotted form so a file can be
+        matched by slicing at its last dot and one dict probe. Exact names (".DS_Store"
+        or a bare "DS_Store") get their own map, and multi-dot extensions such as
+        "tar.gz" fall back to a suffix check. Dots are added and case is folded
+        here, once, rather than for every file.
+        """
+        by_ext: dict[str, str] = {}
+        by_name: dict[str, str] = {}
+        suffixes: list[tuple[str, str]] = []
         for ext in extensions:
+            key = ext.lower() if ignore_case else ext
             # Normalize extension (add dot if missing)
-            ext_normalized = ext if ext.startswith(".") else f".{ext}"
-            if name.endswith(ext_normalized) or name == ext.lstrip("."):
-                return ext
-        return None
+            ext_normalized = key if key.startswith(".") else f".{key}"
+            if ext_normalized.count(".") == 1:
+                by_ext.setdefault(ext_normalized, ext)
+            else:
+                suffixes.append((ext_normalized, ext))
+            by_name.setdefault(ext_normalized, ext)
+            by_name.setdefault(key.lstrip("."), ext)
+        return by_ext, by_name, suffixes
+
+    def match_folder(self, name: str, patterns: PatternSet) -> str | None:
+        """Check if folder name matches any pattern. Returns matched pattern or None."""
+        key = name.lower() if patterns.ignore_case else name
+        return _match_folder_key(name, key, patterns)
+
+    def match_file(self, name: str, patterns: PatternSet) -> str | None:
+        """Check if file matches any extension pattern. Returns matched pattern or None."""
+        key = name.lower() if patterns.ignore_case else name
+        return _match_file_key(key, patterns)
 
     def scan_directory(
         self,
         root_path: Path,
-        folder_patterns: list[str],
-        extension_patterns: list[str],
-        include_sizes: bool = True
+        patterns: PatternSet,
+        size_mode: SizeMode = "lazy",
+        max_workers: int | None = None
     ) -> Iterator[ScanResult]:
         """
         Recursively scan a directory for matching folders and files.
         
+        Directories are read concurrently by a pool of worker threads; results
+        are yielded in the order workers find them.
+
         Args:
             root_path: The root directory to scan
-            folder_patterns: List of folder name patterns to match
-            extension_patterns: List of file extension patterns to match
-            include_sizes: Whether to calculate sizes (can be slow for large dirs)
+            patterns: Folder and extension patterns from compile_patterns
+            size_mode: When to calculate sizes; "eager" can be slow for large dirs,
+                "fast" is quicker but folder sizes are approximate
+            max_workers: Number of traversal threads (defaults to DEFAULT_WORKERS)
             
         Yields:
             ScanResult objects for each matched item
         """
         self._scanning = True
-        self._cancelled = False
+        self._cancelled.clear()
         self.results = []
 
         try:
-            for dirpath, dirnames, filenames in os.walk(root_path):
-                if self._cancelled:
-                    break
-
-                current_dir = Path(dirpath)
-                
-                # Check folder names - if matched, don't descend into them
-                dirs_to_remove = []
-                for dirname in dirnames:
-                    if self._cancelled:
-                        break
-                        
-                    matched_pattern = self.match_folder(dirname, folder_patterns)
-                    if matched_pattern:
-                        full_path = current_dir / dirname
-                        size = self.get_size(full_path) if include_sizes else 0
-                        result = ScanResult(
-                            path=full_path,
-                            item_type="folder",
-                            size=size,
-                            matched_pattern=matched_pattern
-                        )
-                        self.results.append(result)
-                        yield result
-                        # Don't descend into matched folders
-                        dirs_to_remove.append(dirname)
-                
-                # Remove matched folders from traversal
-                for dirname in dirs_to_remove:
-                    dirnames.remove(dirname)
-                
-                # Check file names
-                for filename in filenames:
-                    if self._cancelled:
-                        break
-                        
-                    matched_pattern = self.match_file(filename, extension_patterns)
-                    if matched_pattern:
-                        full_path = current_dir / filename
-                        try:
-                            size = full_path.stat().st_size if include_sizes else 0
-                        except (OSError, PermissionError):
-                            size = 0
-                        result = ScanResult(
-                            path=full_path,
-                            item_type="file",
-                            size=size,
-                            matched_pattern=matched_pattern
-                        )
-                        self.results.append(result)
-                        yield result
-
-        except (OSError, PermissionError) as e:
-            # Log or handle permission errors gracefully
-            pass
+            for result in self._scan(
+                root_path, patterns, size_mode,
+                max_workers or DEFAULT_WORKERS
+            ):
+                self.results.append(result)
+                yield result
         finally:
             self._scanning = False
 
+    def _scan(
+        self,
+        root_path: str | Path,
+        patterns: PatternSet,
+        size_mode: SizeMode,
+        max_workers: int,
+    ) -> Iterator[ScanResult]:
+        """
+        Traverse the tree depth-first with a pool of scandir workers.
+
+        Workers pop directories from a shared LIFO stack, stream matches back
+        through a queue and push unmatched child directories onto the stack.
+        The walk is finished once the stack is empty and no worker is busy.
+        """
+        stack: deque[tuple[str | Path, int]] = deque([(root_path, 0)])
+        condition = threading.Condition()
+        results: queue.SimpleQueue = queue.SimpleQueue()
+        stopped = threading.Event()
+        busy = 0
+
+        def worker() -> None:
+            nonlocal busy
+            try:
+                while True:
+                    with condition:
+                        while not stack and busy and not self._should_stop(stopped):
+                            condition.wait()
+                        if not stack or self._should_stop(stopped):
+                            condition.notify_all()
+                            return
+                        path, depth = stack.pop()
+                        busy += 1
+
+                    subdirs: list[str] = []
+                    try:
+                        for result in self._scan_dir(
+                            path, patterns, size_mode, subdirs
+                        ):
+                            results.put(result)
+                    finally:
+                        with condition:
+                            busy -= 1
+                            if depth < MAX_SCAN_DEPTH:
+                                stack.extend((subdir, depth + 1) for subdir in subdirs)
+                            condition.notify_all()
+            except BaseException as e:
+                # Hand the error to the consumer rather than losing it with
+                # this thread; the finally below stops the other workers
+                results.put(e)
+            finally:
+                results.put(_WORKER_DONE)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for _ in range(max_workers):
+                executor.submit(worker)
+
+            running = max_workers
+            while running:
+                item = results.get()
+                if item is _WORKER_DONE:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Also reached when the consumer stops iterating early
+            stopped.set()
+            with condition:
+                condition.notify_all()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _should_stop(self, stopped: threading.Event) -> bool:
+        """Check whether traversal workers should exit early."""
+        return self._cancelled.is_set() or stopped.is_set()
+
+    def _scan_dir(
+        self,
+        path: str | Path,
+        patterns: PatternSet,
+        size_mode: SizeMode,
+        subdirs: list[str],
+    ) -> Iterator[ScanResult]:
+        """
+        Scan a single directory with os.scandir.
+
+        Yields matched entries and appends unmatched child directories to
+        subdirs so the caller can schedule them.
+        """
+        if self._cancelled.is_set():
+            return
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except (OSError, PermissionError):
+            return
+
+        # Bind the per-directory lookups to locals; each name is case-folded
+        # once here and the matchers take the folded key
+        match_folder = _match_folder_key
+        match_file = _match_file_key
+        ignore_case = patterns.ignore_case
+        add_subdir = subdirs.append
+
+        for entry in entries:
+            name = entry.name
+            key = name.lower() if ignore_case else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                matched_pattern = match_folder(name, key, patterns)
+
+                if not matched_pattern:
+                    add_subdir(entry.path)
+                    continue
+
+                if size_mode == "eager" or size_mode == "fast":
+                    if self._cancelled.is_set():
+                        return
+                    if size_mode == "fast":
+                        size = self.get_size_fast(entry.path)
+                    else:
+                        size = self._dir_size(entry.path)
+                else:
+                    size = 0 if size_mode == "none" else None
+                yield ScanResult(
+                    path=entry.path,
+                    item_type="folder",
+                    matched_pattern=matched_pattern,
+                    _size=size
+                )
+            else:
+                matched_pattern = match_file(key, patterns)
+
+                if not matched_pattern:
+                    continue
+
+                if size_mode == "eager" or size_mode == "fast":
+                    try:
+                        size = entry.stat().st_size
+                    except (OSError, PermissionError):
+                        size = 0
+                else:
+                    size = 0 if size_mode == "none" else None
+                yield ScanResult(
+                    path=entry.path,
+                    item_type="file",
+                    matched_pattern=matched_pattern,
+                    _size=size
+                )
+
     @property
     def is_scanning(self) -> bool:
         """Check if a scan is currently in progress."""
         return self._scanning
 
 
+def _match_folder_key(name: str, key: str, patterns: PatternSet) -> str | None:
+    """Match a folder by name; key is the name already case-folded for patterns."""
+    matched = patterns.literal_folders.get(key)
+    if matched is None and patterns.glob_folders is not None:
+        # Glob matchers fold case themselves, so they get the name as is
+        matched = patterns.glob_folders(name)
+    return matched
+
+
+def _match_file_key(key: str, patterns: PatternSet) -> str | None:
+    """Match a file by its name, already case-folded for patterns."""
+    # Every key in literal_exts starts with a dot, so when key has no dot
+    # the one-character slice simply misses
+    matched = patterns.literal_exts.get(key[key.rfind("."):]) or patterns.exact_names.get(key)
+    if matched is None:
+        for suffix, ext in patterns.suffix_exts:
+            if key.endswith(suffix):
+                return ext
+    return matched
+
+
+def _regex_glob_matcher(globs: list[str], ignore_case: bool) -> GlobMatcher:
+    """
+    Compile globs into one regex alternation.
+
+    Named groups map the match back to the original pattern string.
+    """
+    regex = re.compile("|".join(
+        f"(?P<p{i}>{fnmatch.translate(p)})" for i, p in enumerate(globs)
+    ), re.IGNORECASE if ignore_case else 0)
+
+    def match(name: str) -> str | None:
+        found = regex.match(name)
+        if found:
+            return globs[int(found.lastgroup[1:])]
+        return None
+
+    return match
+
+
+def _hyperscan_glob_matcher(globs: list[str], ignore_case: bool) -> GlobMatcher | None:
+    """
+    Compile globs into a Hyperscan block database.
+
+    Returns None if hyperscan is not installed or rejects a pattern, so the
+    caller can fall back to the regex matcher.
+    """
+    if hyperscan is None:
+        return None
+
+    # fnmatch wraps runs of wildcards in atomic groups, which Hyperscan does
+    # not support; as plain groups they accept the same names. Anchor both
+    # ends since Hyperscan reports matches anywhere in the input.
+    expressions = [
+        ("^" + fnmatch.translate(p).replace("(?>", "(?:")[:-2] + "\\z").encode()
+        for p in globs
+    ]
+    # Match names as UTF-8 text, so wildcards consume whole characters and
+    # caseless matching folds non-ASCII letters, as the regex matcher does
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    if ignore_case:
+        flags |= hyperscan.HS_FLAG_CASELESS
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(globs))),
+            elements=len(globs),
+            flags=[flags] * len(globs),
+        )
+    except hyperscan.error:
+        return None
+
+    # Names that aren't valid UTF-8 reach us with surrogate escapes and can't
+    # be scanned in UTF-8 mode; the regex matcher handles those
+    fallback = _regex_glob_matcher(globs, ignore_case)
+
+    # Scratch space can't be shared between concurrent scans, so each
+    # traversal thread gets its own
+    local = threading.local()
+
+    def match(name: str) -> str | None:
+        try:
+            data = name.encode()
+        except UnicodeEncodeError:
+            return fallback(name)
+        scratch = getattr(local, "scratch", None)
+        if scratch is None:
+            scratch = local.scratch = hyperscan.Scratch(database)
+        matched_ids: list[int] = []
+        database.scan(
+            data,
+            match_event_handler=lambda pattern_id, *_: matched_ids.append(pattern_id),
+            scratch=scratch,
+        )
+        # Report the earliest listed pattern, like the regex alternation
+        return globs[min(matched_ids)] if matched_ids else None
+
+    return match
+
+
+@functools.lru_cache(maxsize=4096)
 def format_size(size_bytes: int) -> str:
     """Format bytes into human-readable size string."""
-    if size_bytes < 1024:
+    if size_bytes < _KB:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    elif size_bytes < _MB:
+        return f"{size_bytes / _KB:.1f} KB"
+    elif size_bytes < _GB:
+        return f"{size_bytes / _MB:.1f} MB"
     else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+        return f"{size_bytes / _GB:.2f} GB"